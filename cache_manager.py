@@ -6,10 +6,16 @@ Enterprise-grade caching with freshness tracking and cost optimization
 import sqlite3
 import json
 import hashlib
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Optional, Any, Tuple
 import os
 
+
+def _utcnow() -> datetime:
+    """Naive UTC now, comparable with SQLite's datetime('now') and CURRENT_TIMESTAMP"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class DataCacheManager:
     """
     Manages intelligent caching of all data with freshness tracking
@@ -22,6 +28,9 @@ class DataCacheManager:
         'breaking_news': 0,  # Always fresh
         'earnings_day': 0,  # Always fresh on earnings day
         
+        # Intraday data (1 hour cache)
+        'treasury_yield_10y': 1,  # DGS10 posts daily; trend must track it
+        
         # Daily data (24 hour cache)
         'fed_rate': 24,
         'inflation': 24,
@@ -150,12 +159,17 @@ class DataCacheManager:
             return True  # No cached data, must refresh
         
         created_at = datetime.fromisoformat(result[0])
-        age_hours = (datetime.now() - created_at).total_seconds() / 3600
+        age_hours = (_utcnow() - created_at).total_seconds() / 3600
         
         return age_hours >= max_age_hours
     
-    def get(self, data_type: str, ticker: str = None, **kwargs) -> Optional[Dict]:
-        """Get cached data if fresh, otherwise return None"""
+    def get(self, data_type: str, ticker: str = None, log_hit: bool = True,
+            **kwargs) -> Optional[Dict]:
+        """Get cached data if fresh, otherwise return None
+        
+        log_hit=False skips the api_costs entry, for free lookups that
+        shouldn't count towards the hit and cost-saved stats.
+        """
         
         key = self._generate_key(data_type, ticker, **kwargs)
         
@@ -181,7 +195,8 @@ class DataCacheManager:
             conn.commit()
             
             # Log cache hit
-            self._log_cache_hit(data_type, ticker)
+            if log_hit:
+                self._log_cache_hit(data_type, ticker)
         
         conn.close()
         
@@ -196,7 +211,8 @@ class DataCacheManager:
         key = self._generate_key(data_type, ticker, **kwargs)
         max_age_hours = self.FRESHNESS_RULES.get(data_type, 24)
         
-        expires_at = datetime.now() + timedelta(hours=max_age_hours)
+        # UTC, like the datetime('now') it is checked against
+        expires_at = _utcnow() + timedelta(hours=max_age_hours)
         
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
@@ -232,6 +248,7 @@ class DataCacheManager:
             'fed_rate': 0.001,  # FRED is free but time saved
             'inflation': 0.001,
             'treasury_yield': 0.001,
+            'treasury_yield_10y': 0.001,
             'supplier_relationships': 0.17,  # Expensive AI analysis
             'customer_relationships': 0.17,
             'macro_trends': 0.06,
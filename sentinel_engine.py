@@ -107,6 +107,17 @@ class SentinelEngine:
             )
         ''')
         
+        # History grows by one row per analysis - index the per-ticker date
+        # range reads so they don't scan every ticker's rows
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_analysis_history_ticker_date
+            ON analysis_history (ticker, analysis_date)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_change_log_ticker_date
+            ON change_log (ticker, change_date)
+        ''')
+        
         conn.commit()
         conn.close()
     
@@ -11,21 +11,26 @@ Features:
 """
 
 import streamlit as st
-import yfinance as yf
-from fredapi import Fred
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import plotly.graph_objects as go
+from concurrent.futures import ThreadPoolExecutor
+import queue
+from functools import partial
+from types import SimpleNamespace
+import hashlib
+import bisect
+import math
 import warnings
-warnings.filterwarnings('ignore')
+# Silence known-noisy third-party deprecations only, so pandas/numpy
+# warnings (e.g. PerformanceWarning) still surface
+warnings.filterwarnings('ignore', category=FutureWarning, module='yfinance')
+warnings.filterwarnings('ignore', category=DeprecationWarning, module='yfinance')
+warnings.filterwarnings('ignore', category=UserWarning, module='fredapi')
 
-# Import analyzers
-from company_analyzer import CompanyPerformanceAnalyzer
-from supplier_analyzer import SupplierAnalyzer
-from customer_analyzer import CustomerAnalyzer
-from macro_analyzer import MacroFactorAnalyzer
-from analyst_critique import AnalystCritique
+# Analyzer modules (edgar, the Anthropic SDK) and the market data clients
+# (yfinance, fredapi) are imported where they are first used rather than on
+# every page load
 
 # ============================================================================
 # ENTERPRISE FEATURES - Import with graceful fallback
@@ -48,6 +53,88 @@ AGENT_AVAILABLE = False  # Disabled to prevent accidental usage
 
 st.set_page_config(page_title="Factor Impact Intelligence", page_icon="💰", layout="wide")
 
+# ============================================================================
+# CACHED CALLS
+# ============================================================================
+@st.cache_data(ttl=86400, max_entries=20, show_spinner=False)
+def cached_critique(pdf_sha, platform_sig, _pdf_data, filename, _platform_data, _api_key):
+    """
+    Run the analyst critique once per (report, analysis) pair
+    
+    Keyed on the PDF hash and the analysis it is compared against, so
+    reruns and repeat clicks never re-invoke the Anthropic API. Failed
+    critiques raise instead of returning, so they are not cached.
+    """
+    from analyst_critique import AnalystCritique
+    
+    critique_engine = AnalystCritique(anthropic_api_key=_api_key)
+    result = critique_engine.generate_critique(
+        pdf_data=_pdf_data,
+        filename=filename,
+        platform_data=_platform_data
+    )
+    if not result.get('success'):
+        raise RuntimeError(result.get('error', 'Unknown error'))
+    return result
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_cache_stats(_cache_manager, db_path):
+    """Cache statistics, refreshed at most every 30 seconds"""
+    return _cache_manager.get_stats()
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_historical_trend(_sentinel, db_path, ticker, days, as_of):
+    """Historical score trend; as_of ties the entry to the latest analysis"""
+    return _sentinel.get_historical_trend(ticker, days=days)
+
+
+# Charts never need more points than the browser can usefully draw
+TREND_MAX_POINTS = 500
+
+
+def lttb_indices(scores, n_out=TREND_MAX_POINTS):
+    """
+    Indices of the points Largest-Triangle-Three-Buckets keeps
+    
+    Buckets are taken over analysis order, so the first and last analyses
+    always survive and each bucket keeps the point that best preserves the
+    line's shape. Short histories come back untouched.
+    """
+    n = len(scores)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    
+    x = np.arange(n, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt = edges[i + 2] if i + 2 < len(edges) else n
+        next_scores = scores[hi:nxt]
+        next_scores = next_scores[~np.isnan(next_scores)]
+        avg_x = x[hi:nxt].mean()
+        avg_y = next_scores.mean() if next_scores.size else np.nan
+        area = np.abs((x[a] - avg_x) * (scores[lo:hi] - scores[a])
+                      - (x[a] - x[lo:hi]) * (avg_y - scores[a]))
+        a = lo + int(np.nan_to_num(area, nan=-1.0).argmax())
+        keep[i + 1] = a
+    return keep
+
+
+@st.cache_data(ttl=3600, max_entries=50, show_spinner=False)
+def build_trend_frame(ticker, dates, scores):
+    """Score trend chart data, rebuilt only when the ticker's history changes"""
+    # Reference levels ride along as flat series instead of annotated lines
+    return pd.DataFrame(
+        {'Combined Score': scores, 'Strong Buy': 7.5, 'Hold': 5.5},
+        index=pd.DatetimeIndex(pd.to_datetime(dates), name='Date')
+    )
+
+
 # ============================================================================
 # SESSION STATE INITIALIZATION
 # ============================================================================
@@ -102,7 +189,8 @@ with st.sidebar:
         # Show cache stats
         if st.session_state.get('cache_manager'):
             try:
-                cache_stats = st.session_state.cache_manager.get_stats()
+                cache_manager = st.session_state.cache_manager
+                cache_stats = cached_cache_stats(cache_manager, cache_manager.db_path)
                 with st.expander("📊 Cache Statistics"):
                     col1, col2 = st.columns(2)
                     with col1:
@@ -156,805 +244,843 @@ with st.sidebar:
     """)
 
 
+# ============================================================================
+# SCORING TABLES
+# ============================================================================
+# Signal bands on the 0-10 scale, shared by the monetary module and Summary
+SIGNAL_THRESHOLDS = (5.5, 6.5, 7.5)
+SIGNAL_LABELS = ("SELL", "HOLD", "BUY", "STRONG BUY")
+
+SEVERITY_ICONS = {"High": "🔴", "Medium": "🟡", "Low": "🟢"}
+SIGNIFICANCE_ICONS = {"HIGH": "🔴", "MEDIUM": "🟡", "LOW": "🟢"}
+
+
+# Fed, inflation and yield weights in the monetary composite
+MONETARY_WEIGHTS = (0.35, 0.35, 0.30)
+
+# Monetary trend bands: a change is labelled by the first band its size
+# does not exceed, so e.g. a 25bp move is "tightening", anything bigger is
+# "aggressive_tightening"
+FED_TREND_BANDS = (0.0, 0.25)
+FED_RISING = ("stable", "tightening", "aggressive_tightening")
+FED_FALLING = ("stable", "easing", "aggressive_easing")
+YIELD_TREND_BANDS = (0.1, 0.5)
+YIELD_RISING = ("stable", "rising", "rapid_rise")
+YIELD_FALLING = ("stable", "falling", "rapid_fall")
+# YoY CPI: 1.5% itself counts as on target, hence the float just below it
+INFLATION_BANDS = (math.nextafter(1.5, 0.0), 2.5, 4.0)
+INFLATION_LABELS = ("low", "target", "elevated", "high")
+
+
+def score_to_signal(score):
+    """Map a 0-10 composite score to its trading signal"""
+    return SIGNAL_LABELS[bisect.bisect_right(SIGNAL_THRESHOLDS, score)]
+
+
+def change_to_trend(change, bands, rising, falling):
+    """Label a signed change by direction and by the band its size falls in"""
+    labels = rising if change > 0 else falling
+    return labels[bisect.bisect_left(bands, abs(change))]
+
+
+def combine_monetary_scores(fed_score, inf_score, yld_score, beta):
+    """
+    Fold the three monetary factor scores into a 0-10 composite
+    
+    High-beta stocks (beta > 1.5) feel rate moves harder, so their factor
+    scores are amplified and clipped to [-2, 2] first. Returns the scores
+    actually used plus the unrounded composite. Plain scalar math with no
+    analyzer state, so it can be reused in batch or backtest loops.
+    """
+    if beta > 1.5:
+        fed_score = max(-2.0, min(2.0, fed_score * 1.3))
+        inf_score = max(-2.0, min(2.0, inf_score * 1.2))
+        yld_score = max(-2.0, min(2.0, yld_score * 1.3))
+    fed_weight, inf_weight, yld_weight = MONETARY_WEIGHTS
+    weighted = (fed_score * fed_weight) + (inf_score * inf_weight) + (yld_score * yld_weight)
+    return fed_score, inf_score, yld_score, 5.5 + (weighted * 2.25)
+
+
+# ============================================================================
+# MARKET DATA FETCHERS (cached)
+# ============================================================================
+# FRED and Yahoo data update at most daily, so an hour-long cache turns
+# repeat analyses within a session into dict lookups. The FRED series are
+# monthly/daily macro releases shared by every ticker and keep for six hours.
+# Every fetch takes its window's start date, so cache keys roll over once
+# a day.
+def history_start(days=365):
+    """Start date of the trailing data window"""
+    return (datetime.now() - timedelta(days=days)).date()
+
+
+def daily_closes(stock, start):
+    """Daily closes since start, indexed by tz-naive exchange dates"""
+    hist = stock.history(start=start, actions=False)
+    if hist.empty:
+        return pd.Series(dtype=float)
+    closes = hist['Close']
+    # Exchanges differ in tz; wall-clock dates line up across them
+    if closes.index.tz is not None:
+        closes.index = closes.index.tz_localize(None)
+    return closes
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_stock_data(ticker, start):
+    """Daily closes since start for a ticker, or None if Yahoo has none"""
+    import yfinance as yf
+    
+    closes = daily_closes(yf.Ticker(ticker), start)
+    return None if closes.empty else closes
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_stock_info(ticker):
+    """Yahoo's info dict for a ticker; errors raise, so they are never cached"""
+    import yfinance as yf
+    
+    return yf.Ticker(ticker).info
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_market_closes(start):
+    """SPY daily closes since start, shared by every ticker's beta fallback"""
+    import yfinance as yf
+    
+    return daily_closes(yf.Ticker('SPY'), start)
+
+
+@st.cache_data(ttl=21600, show_spinner=False)
+def fetch_fred_series(series_id, start, _fred):
+    """Observations of a FRED series since start"""
+    return _fred.get_series(series_id, observation_start=start)
+
+
+# Days of FRED history each trend needs, with room for release lag:
+# FEDFUNDS compares 4 monthly prints, CPI needs 13 for a YoY change and
+# DGS10 compares 22 trading days
+FRED_WINDOWS = {'FEDFUNDS': 180, 'CPIAUCSL': 450, 'DGS10': 60}
+
+
+def fetch_fred_trend_series(series_id, _fred):
+    """Just enough recent history of a FRED series for its trend"""
+    return fetch_fred_series(series_id, history_start(FRED_WINDOWS[series_id]), _fred)
+
+
 # ============================================================================
 # MONETARY FACTOR ANALYZER (Built-in)
 # ============================================================================
 class MonetaryFactorAnalyzer:
     """Analyzes monetary factors"""
     
-    def __init__(self, fred_api_key):
+    # Factor trend -> score, built once instead of on every analyze() call
+    FED_SCORES = {"aggressive_tightening": -2.0, "tightening": -1.0, "aggressive_easing": 2.0, "easing": 1.0, "stable": 0.0}
+    INF_SCORES = {"high": -1.5, "elevated": -0.5, "target": 1.0, "low": 0.0}
+    YLD_SCORES = {"rapid_rise": -2.0, "rising": -1.0, "rapid_fall": 2.0, "falling": 1.0, "stable": 0.0}
+    
+    def __init__(self, fred_api_key, use_cache=True):
+        from fredapi import Fred
+        
         self.fred = Fred(api_key=fred_api_key)
+        # FRED trends also go to the on-disk cache so they survive restarts
+        self.use_cache = use_cache and ENTERPRISE_FEATURES
+        if self.use_cache:
+            self.cache = DataCacheManager()
+    
+    def _cached_trend(self, data_type, fetch):
+        """
+        Trend dict from the data cache, fetched and stored on a miss
+        
+        The cache is best-effort: a read or write error (e.g. the SQLite
+        file locked by another module) falls back to the live fetch and
+        never fails the factor.
+        """
+        if self.use_cache:
+            try:
+                # FRED is free, so these reads stay out of the hit stats
+                cached = self.cache.get(data_type, log_hit=False)
+                if cached:
+                    return cached
+            except:
+                pass
+        data = fetch()
+        if data and self.use_cache:
+            try:
+                self.cache.set(data_type, data)
+            except:
+                pass
+        return data
     
-    def get_stock_data(self, ticker):
+    def get_stock_data(self, ticker, start):
         try:
-            stock = yf.Ticker(ticker)
-            end = datetime.now()
-            start = end - timedelta(days=365)
-            hist = stock.history(start=start, end=end)
-            if hist.empty:
-                return None, None
-            return hist, stock.info
+            closes = fetch_stock_data(ticker, start)
         except:
             return None, None
+        if closes is None:
+            return None, None
+        # info is a separate, flakier Yahoo call; without it only the reported
+        # beta is lost and calculate_beta falls back to the SPY regression
+        try:
+            info = fetch_stock_info(ticker)
+        except:
+            info = {}
+        return closes, info
     
-    def calculate_beta(self, stock_data, info):
+    def calculate_beta(self, closes, info, start):
         try:
-            if 'beta' in info and info['beta']:
+            if info.get('beta'):
                 return float(info['beta'])
-            returns = stock_data['Close'].pct_change().dropna()
-            spy = yf.Ticker('SPY')
-            spy_hist = spy.history(start=stock_data.index[0], end=stock_data.index[-1])
-            spy_returns = spy_hist['Close'].pct_change().dropna()
-            aligned = pd.DataFrame({'stock': returns, 'market': spy_returns}).dropna()
-            if len(aligned) < 30:
+            # SPY is only needed when Yahoo has no beta, and is cached once
+            # for all tickers; align it to the ticker's trading days
+            market = fetch_market_closes(start).reindex(closes.index)
+            pair = np.column_stack([closes.to_numpy(dtype=float), market.to_numpy(dtype=float)])
+            returns = np.diff(pair, axis=0) / pair[:-1]
+            returns = returns[~np.isnan(returns).any(axis=1)]
+            if len(returns) < 30:
                 return 1.0
-            return aligned.cov().loc['stock', 'market'] / aligned['market'].var()
+            stock_returns, market_returns = returns[:, 0], returns[:, 1]
+            return float(np.cov(stock_returns, market_returns)[0, 1] / market_returns.var(ddof=1))
         except:
             return 1.0
     
     def get_fed_rate(self):
+        return self._cached_trend('fed_rate', self._fetch_fed_rate)
+    
+    def get_inflation(self):
+        return self._cached_trend('inflation', self._fetch_inflation)
+    
+    def get_yield(self):
+        return self._cached_trend('treasury_yield_10y', self._fetch_yield)
+    
+    def _fetch_fed_rate(self):
         try:
-            end = datetime.now()
-            start = end - timedelta(days=365)
-            data = self.fred.get_series('FEDFUNDS', observation_start=start, observation_end=end)
+            data = fetch_fred_trend_series('FEDFUNDS', self.fred)
             if data.empty:
                 return None
-            current = data.iloc[-1]
-            prev = data.iloc[-4] if len(data) >= 4 else data.iloc[0]
+            current = data.iat[-1]
+            prev = data.iat[-4] if len(data) >= 4 else data.iat[0]
             change = current - prev
-            if change > 0.25:
-                trend = "aggressive_tightening"
-            elif change > 0:
-                trend = "tightening"
-            elif change < -0.25:
-                trend = "aggressive_easing"
-            elif change < 0:
-                trend = "easing"
-            else:
-                trend = "stable"
+            trend = change_to_trend(change, FED_TREND_BANDS, FED_RISING, FED_FALLING)
             return {'current': current, 'change': change, 'trend': trend}
         except:
             return None
     
-    def get_inflation(self):
+    def _fetch_inflation(self):
         try:
-            end = datetime.now()
-            start = end - timedelta(days=365)
-            cpi = self.fred.get_series('CPIAUCSL', observation_start=start, observation_end=end)
+            cpi = fetch_fred_trend_series('CPIAUCSL', self.fred)
             if cpi.empty or len(cpi) < 12:
                 return None
-            current = cpi.iloc[-1]
-            prev = cpi.iloc[-13] if len(cpi) >= 13 else cpi.iloc[0]
+            current = cpi.iat[-1]
+            prev = cpi.iat[-13] if len(cpi) >= 13 else cpi.iat[0]
             yoy = ((current - prev) / prev) * 100
-            if yoy > 4.0:
-                trend = "high"
-            elif yoy > 2.5:
-                trend = "elevated"
-            elif yoy >= 1.5:
-                trend = "target"
-            else:
-                trend = "low"
+            trend = INFLATION_LABELS[bisect.bisect_left(INFLATION_BANDS, yoy)]
             return {'yoy': yoy, 'trend': trend}
         except:
             return None
     
-    def get_yield(self):
+    def _fetch_yield(self):
         try:
-            end = datetime.now()
-            start = end - timedelta(days=365)
-            data = self.fred.get_series('DGS10', observation_start=start, observation_end=end).dropna()
+            data = fetch_fred_trend_series('DGS10', self.fred).dropna()
             if data.empty:
                 return None
-            current = data.iloc[-1]
-            prev = data.iloc[-22] if len(data) >= 22 else data.iloc[0]
+            current = data.iat[-1]
+            prev = data.iat[-22] if len(data) >= 22 else data.iat[0]
             change = current - prev
-            if change > 0.5:
-                trend = "rapid_rise"
-            elif change > 0.1:
-                trend = "rising"
-            elif change < -0.5:
-                trend = "rapid_fall"
-            elif change < -0.1:
-                trend = "falling"
-            else:
-                trend = "stable"
+            trend = change_to_trend(change, YIELD_TREND_BANDS, YIELD_RISING, YIELD_FALLING)
             return {'current': current, 'change': change, 'trend': trend}
         except:
             return None
     
     def analyze(self, ticker):
-        stock_data, info = self.get_stock_data(ticker)
-        if stock_data is None:
-            return {'success': False, 'error': 'No data'}
+        start = history_start()
         
-        beta = self.calculate_beta(stock_data, info)
-        fed_data = self.get_fed_rate()
-        inf_data = self.get_inflation()
-        yld_data = self.get_yield()
+        # Yahoo and the three FRED series are independent requests
+        executor = ThreadPoolExecutor(max_workers=4)
+        stock_future = executor.submit(self.get_stock_data, ticker, start)
+        fed_future = executor.submit(self.get_fed_rate)
+        inf_future = executor.submit(self.get_inflation)
+        yld_future = executor.submit(self.get_yield)
         
-        fed_scores = {"aggressive_tightening": -2.0, "tightening": -1.0, "aggressive_easing": 2.0, "easing": 1.0, "stable": 0.0}
-        fed_score = fed_scores.get(fed_data['trend'], 0) if fed_data else 0
-        
-        inf_scores = {"high": -1.5, "elevated": -0.5, "target": 1.0, "low": 0.0}
-        inf_score = inf_scores.get(inf_data['trend'], 0) if inf_data else 0
+        closes, info = stock_future.result()
+        if closes is None:
+            # Unknown ticker - don't wait on the FRED requests
+            executor.shutdown(wait=False, cancel_futures=True)
+            return {'success': False, 'error': 'No data'}
         
-        yld_scores = {"rapid_rise": -2.0, "rising": -1.0, "rapid_fall": 2.0, "falling": 1.0, "stable": 0.0}
-        yld_score = yld_scores.get(yld_data['trend'], 0) if yld_data else 0
+        beta = self.calculate_beta(closes, info, start)
+        fed_data = fed_future.result()
+        inf_data = inf_future.result()
+        yld_data = yld_future.result()
+        executor.shutdown()
         
-        if beta > 1.5:
-            fed_score = max(-2.0, min(2.0, fed_score * 1.3))
-            inf_score = max(-2.0, min(2.0, inf_score * 1.2))
-            yld_score = max(-2.0, min(2.0, yld_score * 1.3))
+        fed_score = self.FED_SCORES.get(fed_data['trend'], 0) if fed_data else 0
+        inf_score = self.INF_SCORES.get(inf_data['trend'], 0) if inf_data else 0
+        yld_score = self.YLD_SCORES.get(yld_data['trend'], 0) if yld_data else 0
         
-        weighted = (fed_score * 0.35) + (inf_score * 0.35) + (yld_score * 0.30)
-        composite = round(5.5 + (weighted * 2.25), 1)
+        fed_score, inf_score, yld_score, composite = combine_monetary_scores(
+            fed_score, inf_score, yld_score, beta
+        )
+        composite = round(composite, 1)
         
-        if composite >= 7.5:
-            signal = "STRONG BUY"
-        elif composite >= 6.5:
-            signal = "BUY"
-        elif composite >= 5.5:
-            signal = "HOLD"
-        else:
-            signal = "SELL"
+        signal = score_to_signal(composite)
         
         return {
-            'success': True, 'ticker': ticker.upper(), 'score': composite,
+            'success': True, 'ticker': ticker, 'score': composite,
             'signal': signal, 'beta': beta, 'fed': fed_data, 'inf': inf_data,
             'yld': yld_data, 'fed_score': fed_score, 'inf_score': inf_score, 'yld_score': yld_score
         }
 
 
 # ============================================================================
-# MAIN APP
+# ANALYSIS EXECUTION
 # ============================================================================
-if not fred_api_key:
-    st.info("👈 Enter your FRED API key in the sidebar")
-    st.stop()
+# The monetary and company analyzers hold no per-run state, so one instance
+# (and its HTTP clients) is shared across runs; the hour-long TTL keeps their
+# construction-time dates fresh. The LLM analyzers count tokens per run and
+# are built fresh each time.
+@st.cache_resource(ttl=3600, show_spinner=False)
+def get_monetary_analyzer(fred_api_key):
+    """Shared MonetaryFactorAnalyzer for a FRED key"""
+    return MonetaryFactorAnalyzer(fred_api_key=fred_api_key)
+
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def get_company_analyzer():
+    """Shared CompanyPerformanceAnalyzer"""
+    from company_analyzer import CompanyPerformanceAnalyzer
+    
+    return CompanyPerformanceAnalyzer()
+
+
+def run_module(make_analyzer, ticker, cost=None, **kwargs):
+    """
+    Run one module's analyze() and report its cost
+    
+    Exceptions become a failed result so one module can never take down
+    the others when they run side by side. cost is a (result field,
+    default) pair; modules without one are free.
+    """
+    try:
+        result = make_analyzer().analyze(ticker, **kwargs)
+    except Exception as e:
+        return {'success': False, 'error': str(e)}, 0.0
+    return result, (result.get(cost[0], cost[1]) if cost else 0.0)
 
-# Stock input
-col1, col2 = st.columns([3, 1])
-with col1:
-    ticker = st.text_input("Stock Ticker", value="NVDA", help="Enter stock symbol").upper()
-with col2:
-    st.write("")
-    st.write("")
-    analyze_btn = st.button("📊 Analyze All Modules", type="primary")
 
 # ============================================================================
-# RUN ANALYSIS
+# DISPLAY HELPERS
 # ============================================================================
-if analyze_btn and ticker:
-    with st.spinner(f"Analyzing {ticker} (90-120 seconds)..."):
-        total_cost = 0.0
+# (label, results key, summary weight, (green, yellow) thresholds)
+SUMMARY_MODULES = (
+    ("Monetary", 'monetary', 0.25, (7, 6)),
+    ("Company", 'company', 0.25, (7, 6)),
+    ("Supply", 'suppliers', 0.15, (7, 5.5)),
+    ("Demand", 'customers', 0.15, (7, 5.5)),
+    ("Macro", 'macro', 0.20, (7, 5.5)),
+)
+
+_SCORE_COLORS = ("🔴", "🟡", "🟢")
+
+
+def score_color(score, hi=7, mid=6):
+    """Traffic-light emoji for a 0-10 module score"""
+    return _SCORE_COLORS[(score >= mid) + (score >= hi)]
+
+
+# Score bands for the macro factor expanders: (floor, renderer, label)
+_RISK_LEVELS = (
+    (0, st.success, "Low Risk"),
+    (-1, st.warning, "Moderate Risk"),
+    (float('-inf'), st.error, "High Risk"),
+)
+_STRENGTH_LEVELS = (
+    (1, st.success, "Strong"),
+    (0, st.info, "Neutral"),
+    (float('-inf'), st.warning, "Weak"),
+)
+
+# (emoji, title, short name, weight, result key, list key, list heading, bands)
+MACRO_FACTORS = (
+    ("🌍", "Geopolitical Risk", "Geopolitical", 0.30, 'geopolitical', 'key_risks', "Key Risks", _RISK_LEVELS),
+    ("⚖️", "Regulatory Risk", "Regulatory", 0.25, 'regulatory', 'key_risks', "Key Risks", _RISK_LEVELS),
+    ("📈", "Industry Dynamics", "Industry", 0.25, 'industry', 'key_trends', "Key Trends", _STRENGTH_LEVELS),
+    ("🛢️", "Commodity & Input Risk", "Commodity", 0.15, 'commodity', 'key_risks', "Key Risks", _RISK_LEVELS),
+    ("🌱", "ESG Factors", "ESG", 0.05, 'esg', 'key_issues', "Key Issues", _RISK_LEVELS),
+)
+
+MACRO_WEIGHTS = np.array([factor[3] for factor in MACRO_FACTORS])
+
+
+def company_factor_view(company_result):
+    """Company factor scores with missing factors/fields filled in once"""
+    factors = company_result.get('factors') or {}
+    
+    def _factor(name):
+        factor = factors.get(name) or {}
+        return {'score': factor.get('score', 0), 'reasoning': factor.get('reasoning', 'N/A')}
+    
+    return SimpleNamespace(
+        revenue=_factor('revenue_growth'),
+        margins=_factor('margins'),
+        health=_factor('financial_health'),
+    )
+
+
+def render_macro_factor(factor, data, expanded=False):
+    """Render one macro factor expander from its MACRO_FACTORS entry"""
+    emoji, title, name, weight, _, list_key, list_heading, levels = factor
+    with st.expander(f"{emoji} **{title}** ({weight:.0%} weight)", expanded=expanded):
+        if data and (data.get('success') or data.get('overall_score') is not None):
+            score = data.get('overall_score', 0)
+            render, label = next((fn, text) for floor, fn, text in levels if score >= floor)
+            render(f"**Score: {score:+.1f}/2.0** ({label})")
+            if data.get('summary'):
+                st.markdown("**Summary:**")
+                st.info(data['summary'])
+            if data.get(list_key):
+                st.markdown(f"**{list_heading}:**\n\n" + "\n\n".join(
+                    f"• {item}" for item in data[list_key]
+                ))
+        else:
+            st.error(f"{name} analysis not available")
+
+
+# ============================================================================
+# TAB RENDERERS
+# ============================================================================
+# Each tab renders inside its own fragment, so interacting with a widget in
+# one tab (e.g. the critique button) reruns that tab only.
+tab_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
+
+
+# ----------------------------------------------------------------------------
+# TAB 1: Summary
+# ----------------------------------------------------------------------------
+@tab_fragment
+def render_summary_tab(results):
+    """Summary tab"""
+    ticker = results['ticker']
+    total_cost = results.get('total_cost', 0)
+    
+    st.markdown(f"## {ticker} - Complete Analysis")
+    
+    # (label, result, weight, thresholds) for every module that succeeded
+    active = [
+        (label, results[key], weight, thresholds)
+        for label, key, weight, thresholds in SUMMARY_MODULES
+        if results[key].get('success', False)
+    ]
+    
+    if active:
+        total_weight = sum(weight for _, _, weight, _ in active)
+        combined_score = round(
+            sum(res['score'] * weight / total_weight for _, res, weight, _ in active), 1
+        )
         
-        # Run all analyses
-        monetary_analyzer = MonetaryFactorAnalyzer(fred_api_key=fred_api_key)
-        try:
-            monetary_result = monetary_analyzer.analyze(ticker)
-        except Exception as e:
-            monetary_result = {'success': False, 'error': str(e)}
+        overall_signal = score_to_signal(combined_score)
         
-        company_analyzer = CompanyPerformanceAnalyzer()
-        try:
-            company_result = company_analyzer.analyze(ticker, verbose=False)
-            total_cost += company_result.get('cost', 0.02)
-        except Exception as e:
-            company_result = {'success': False, 'error': str(e)}
+        # Store combined score
+        st.session_state.analysis_results['combined_score'] = combined_score
+        st.session_state.analysis_results['combined_signal'] = overall_signal
         
-        try:
-            if anthropic_api_key:
-                supplier_analyzer = SupplierAnalyzer(anthropic_api_key=anthropic_api_key)
-                supplier_result = supplier_analyzer.analyze(ticker, verbose=False)
-                total_cost += supplier_result.get('estimated_cost', 0.17)
-            else:
-                supplier_result = {'success': False, 'error': 'API key required'}
-        except Exception as e:
-            supplier_result = {'success': False, 'error': str(e)}
+        st.markdown("### 🎯 Overall Assessment")
         
-        try:
-            if anthropic_api_key:
-                customer_analyzer = CustomerAnalyzer(anthropic_api_key=anthropic_api_key)
-                customer_result = customer_analyzer.analyze(ticker, verbose=False)
-                total_cost += customer_result.get('estimated_cost', 0.17)
-            else:
-                customer_result = {'success': False, 'error': 'API key required'}
-        except Exception as e:
-            customer_result = {'success': False, 'error': str(e)}
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Combined Score", f"{combined_score}/10")
+        with col2:
+            st.metric("Overall Signal", overall_signal)
+        with col3:
+            st.metric("Modules Active", f"{len(active)}/{len(SUMMARY_MODULES)}")
+        with col4:
+            st.metric("Analysis Cost", f"${total_cost:.3f}")
         
-        try:
-            if anthropic_api_key:
-                macro_analyzer = MacroFactorAnalyzer(anthropic_api_key=anthropic_api_key)
-                macro_result = macro_analyzer.analyze(ticker, verbose=False)
-                total_cost += macro_result.get('estimated_cost', 0.06)
-            else:
-                macro_result = {'success': False, 'error': 'API key required'}
-        except Exception as e:
-            macro_result = {'success': False, 'error': str(e)}
+        # Show cache savings if available
+        if ENTERPRISE_FEATURES and st.session_state.get('cache_manager'):
+            try:
+                cache_manager = st.session_state.cache_manager
+                cache_stats = cached_cache_stats(cache_manager, cache_manager.db_path)
+                if cache_stats.get('cost_saved_total', 0) > 0:
+                    st.success(f"💰 Total Cost Saved: ${cache_stats['cost_saved_total']:.2f}")
+            except:
+                pass
+        
+        st.markdown("---")
+        st.markdown("### 📊 Module Breakdown")
+        
+        for col, (label, module_result, weight, thresholds) in zip(st.columns(len(active)), active):
+            with col:
+                score = module_result['score']
+                st.markdown(f"#### {score_color(score, *thresholds)} {label}")
+                st.metric("Score", f"{score}/10")
+                st.caption(f"Weight: {weight:.0%}")
+    else:
+        st.error("All modules failed")
+
+
+# ----------------------------------------------------------------------------
+# TAB 2: Monetary
+# ----------------------------------------------------------------------------
+@tab_fragment
+def render_monetary_tab(results):
+    """Monetary tab"""
+    ticker = results['ticker']
+    monetary_result = results['monetary']
     
-    # Store results in session state
-    st.session_state.analysis_results = {
-        'ticker': ticker,
-        'monetary': monetary_result,
-        'company': company_result,
-        'suppliers': supplier_result,
-        'customers': customer_result,
-        'macro': macro_result,
-        'total_cost': total_cost,
-        'timestamp': datetime.now().isoformat()
-    }
-    st.session_state.analysis_complete = True
+    st.markdown(f"## 💰 Monetary Analysis: {ticker}")
     
-    # =========================================================================
-    # ENTERPRISE: Learn from this analysis
-    # =========================================================================
-    if ENTERPRISE_FEATURES and st.session_state.get('sentinel'):
-        try:
-            key_insights = []
-            if supplier_result.get('success'):
-                key_insights.extend(supplier_result.get('key_findings', []))
-            if customer_result.get('success'):
-                key_insights.extend(customer_result.get('key_findings', []))
-            
-            st.session_state.sentinel.learn_from_analysis(ticker, {
-                **st.session_state.analysis_results,
-                'key_insights': key_insights
-            })
-        except Exception as e:
-            print(f"Sentinel learning failed: {e}")
+    if monetary_result.get('success'):
+        beta = monetary_result.get('beta')
+        fed, inf, yld = monetary_result.get('fed'), monetary_result.get('inf'), monetary_result.get('yld')
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Score", f"{monetary_result['score']}/10")
+        with col2:
+            st.metric("Signal", monetary_result['signal'])
+        with col3:
+            if beta:
+                st.metric("Beta", f"{beta:.2f}")
+        
+        st.markdown("### Factor Scores")
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.markdown("#### 🏦 Fed Rate")
+            st.metric("Score", f"{monetary_result['fed_score']:+.1f}/2.0")
+            if fed:
+                st.info(f"Current: {fed['current']:.2f}%")
+        
+        with col2:
+            st.markdown("#### 📊 Inflation")
+            st.metric("Score", f"{monetary_result['inf_score']:+.1f}/2.0")
+            if inf:
+                st.info(f"YoY: {inf['yoy']:.2f}%")
+        
+        with col3:
+            st.markdown("#### 📈 Yields")
+            st.metric("Score", f"{monetary_result['yld_score']:+.1f}/2.0")
+            if yld:
+                st.info(f"10Y: {yld['current']:.2f}%")
+    else:
+        st.error(f"Error: {monetary_result.get('error')}")
 
-# ============================================================================
-# DISPLAY RESULTS IN TABS
-# ============================================================================
-if st.session_state.analysis_complete:
-    # Get results from session state
-    results = st.session_state.analysis_results
+
+# ----------------------------------------------------------------------------
+# TAB 3: Company
+# ----------------------------------------------------------------------------
+@tab_fragment
+def render_company_tab(results):
+    """Company tab"""
     ticker = results['ticker']
-    monetary_result = results['monetary']
     company_result = results['company']
+    
+    st.markdown(f"## 📄 Company Performance: {ticker}")
+    
+    if company_result.get('success'):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Score", f"{company_result['score']}/10")
+        with col2:
+            st.metric("Signal", company_result['signal'])
+        
+        if company_result.get('data_date'):
+            st.caption(f"📅 Data: {company_result['data_date']}")
+        
+        factors = company_factor_view(company_result)
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.markdown("#### 📊 Revenue")
+            st.metric("Score", f"{factors.revenue['score']:+.1f}/2.0")
+            st.caption(factors.revenue['reasoning'])
+        
+        with col2:
+            st.markdown("#### 📈 Margins")
+            st.metric("Score", f"{factors.margins['score']:+.1f}/2.0")
+            st.caption(factors.margins['reasoning'])
+        
+        with col3:
+            st.markdown("#### 🏥 Health")
+            st.metric("Score", f"{factors.health['score']:+.1f}/2.0")
+            st.caption(factors.health['reasoning'])
+    else:
+        st.error(f"Error: {company_result.get('error')}")
+
+
+# ----------------------------------------------------------------------------
+# TAB 4: Suppliers
+# ----------------------------------------------------------------------------
+@tab_fragment
+def render_supplier_tab(results):
+    """Suppliers tab"""
+    ticker = results['ticker']
     supplier_result = results['suppliers']
+    
+    st.markdown(f"## 🏭 Supplier Analysis: {ticker}")
+    
+    if supplier_result.get('success'):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Risk Score", f"{supplier_result['score']}/10")
+        with col2:
+            st.metric("Risk Level", supplier_result['signal'])
+        with col3:
+            st.metric("Suppliers", len(supplier_result.get('suppliers', [])))
+        
+        if supplier_result.get('key_findings'):
+            st.markdown("**Key Findings:**\n\n" + "\n\n".join(
+                f"• {finding}" for finding in supplier_result['key_findings']
+            ))
+        
+        st.markdown("---")
+        for i, supplier in enumerate(supplier_result.get('suppliers', [])):
+            with st.expander(f"**{i+1}. {supplier['name']}** - {supplier.get('score', 0):+.1f}/2.0"):
+                st.markdown(
+                    f"**Supplies:** {supplier.get('supplies', 'N/A')}\n\n"
+                    f"**Importance:** {supplier.get('importance', 'N/A')}"
+                )
+                
+                if supplier.get('impact_analysis') and supplier['impact_analysis'].get('success'):
+                    impact = supplier['impact_analysis']
+                    if impact.get('summary'):
+                        st.info(impact['summary'])
+    else:
+        st.error(f"Error: {supplier_result.get('error')}")
+
+
+# ----------------------------------------------------------------------------
+# TAB 5: Customers
+# ----------------------------------------------------------------------------
+@tab_fragment
+def render_customer_tab(results):
+    """Customers tab"""
+    ticker = results['ticker']
     customer_result = results['customers']
+    
+    st.markdown(f"## 👥 Customer Analysis: {ticker}")
+    
+    if customer_result.get('success'):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Demand Score", f"{customer_result['score']}/10")
+        with col2:
+            st.metric("Outlook", customer_result['signal'])
+        with col3:
+            st.metric("Customers", len(customer_result.get('customers', [])))
+        
+        if customer_result.get('key_findings'):
+            st.markdown("**Key Findings:**\n\n" + "\n\n".join(
+                f"• {finding}" for finding in customer_result['key_findings']
+            ))
+        
+        st.markdown("---")
+        for i, customer in enumerate(customer_result.get('customers', [])):
+            with st.expander(f"**{i+1}. {customer['name']}** - {customer.get('score', 0):+.1f}/2.0"):
+                st.markdown(
+                    f"**Purchases:** {customer.get('purchases', 'N/A')}\n\n"
+                    f"**Importance:** {customer.get('importance', 'N/A')}"
+                )
+                
+                if customer.get('demand_analysis') and customer['demand_analysis'].get('success'):
+                    demand = customer['demand_analysis']
+                    if demand.get('summary'):
+                        st.info(demand['summary'])
+    else:
+        st.error(f"Error: {customer_result.get('error')}")
+
+
+# ----------------------------------------------------------------------------
+# TAB 6: Macro Factors
+# ----------------------------------------------------------------------------
+@tab_fragment
+def render_macro_tab(results):
+    """Macro Factors tab"""
+    ticker = results['ticker']
     macro_result = results['macro']
-    total_cost = results.get('total_cost', 0)
     
-    # Create tabs - 8 tabs now (including Intelligence)
-    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8 = st.tabs([
-        "📊 Summary", "💰 Monetary", "📄 Company", 
-        "🏭 Suppliers", "👥 Customers", "🌍 Macro", 
-        "🎯 Analyst Critique", "🧠 Intelligence"
-    ])
+    st.markdown(f"## 🌍 Macro Factors: {ticker}")
     
-    # =========================================================================
-    # TAB 1: Summary
-    # =========================================================================
-    with tab1:
-        st.markdown(f"## {ticker} - Complete Analysis")
+    if macro_result.get('success'):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Macro Score", f"{macro_result['score']}/10")
+        with col2:
+            st.metric("Assessment", macro_result['signal'])
+        with col3:
+            cost = macro_result.get('estimated_cost', 0)
+            st.metric("API Cost", f"${cost:.3f}")
+        
+        st.markdown("---")
+        st.markdown("### 📊 Factor Breakdown")
+        st.caption("Weights: 🌍 Geopolitical 30% | ⚖️ Regulatory 25% | 📈 Industry 25% | 🛢️ Commodity 15% | 🌱 ESG 5%")
+        st.markdown("")
+        
+        factor_data = [macro_result.get(f[4]) or {} for f in MACRO_FACTORS]
+        
+        for i, (factor, data) in enumerate(zip(MACRO_FACTORS, factor_data)):
+            render_macro_factor(factor, data, expanded=(i == 0))
+        
+        st.markdown("---")
+        st.markdown("### 💡 Overall Macro Assessment")
+        
+        factor_scores = np.array([data.get('overall_score', 0) for data in factor_data], dtype=float)
+        contributions = factor_scores * MACRO_WEIGHTS
+        rows = "\n".join(
+            f"- {emoji} {name}: {score:+.1f} × {weight:.0%} = {contribution:+.2f}"
+            for (emoji, _, name, weight, *_), score, contribution
+            in zip(MACRO_FACTORS, factor_scores, contributions)
+        )
+        st.markdown(f"""
+**Weighted Calculation:**
+{rows}
+
+**Final Score:** {macro_result['score']}/10 → {macro_result['signal']}
+""")
+        
+    else:
+        st.error(f"❌ Error: {macro_result.get('error', 'Unknown error')}")
+
+
+# ----------------------------------------------------------------------------
+# TAB 7: ANALYST CRITIQUE
+# ----------------------------------------------------------------------------
+@tab_fragment
+def render_critique_tab(results):
+    """Analyst Critique tab"""
+    ticker = results['ticker']
+    
+    st.markdown(f"## 🎯 Analyst Critique: {ticker}")
+    st.markdown("Upload an analyst report (PDF) to compare with our comprehensive analysis")
+    
+    uploaded_file = st.file_uploader(
+        "Upload Analyst Report (PDF)",
+        type=['pdf'],
+        help="Upload Morningstar, Goldman Sachs, or any analyst report",
+        key="analyst_pdf"
+    )
+    
+    if uploaded_file is not None:
+        st.success(f"✅ Uploaded: {uploaded_file.name}")
+        
+        # Capture the upload once, not on every rerun. file_id is unique per
+        # upload, so a revised report with the same name and size is still
+        # re-read; without it (older Streamlit) the bytes are re-hashed.
+        upload_key = getattr(uploaded_file, 'file_id', None)
+        if upload_key is None or st.session_state.get('pdf_upload_key') != upload_key:
+            pdf_bytes = uploaded_file.getvalue()
+            st.session_state.pdf_data = pdf_bytes
+            st.session_state.pdf_sha = hashlib.sha256(pdf_bytes).hexdigest()
+            st.session_state.pdf_upload_key = upload_key
+        pdf_data = st.session_state.pdf_data
+        
+        platform_data = st.session_state.analysis_results
+        critique_key = (
+            st.session_state.pdf_sha,
+            f"{ticker}|{platform_data.get('timestamp', '')}"
+        )
         
-        monetary_ok = monetary_result.get('success', False)
-        company_ok = company_result.get('success', False)
-        supplier_ok = supplier_result.get('success', False)
-        customer_ok = customer_result.get('success', False)
-        macro_ok = macro_result.get('success', False)
+        if st.button("🔍 Critique This Report", type="primary", key="critique_btn"):
+            with st.spinner("Analyzing analyst report and generating critique..."):
+                try:
+                    st.session_state.critique_result = cached_critique(
+                        *critique_key, pdf_data, uploaded_file.name,
+                        platform_data, anthropic_api_key
+                    )
+                    st.session_state.critique_key = critique_key
+                except Exception as e:
+                    st.error(f"❌ Error processing report: {str(e)}")
         
-        if monetary_ok or company_ok or supplier_ok or customer_ok or macro_ok:
-            scores = []
-            weights = []
+        if st.session_state.get('critique_key') == critique_key:
+            result = st.session_state.critique_result
+            analyst_thesis = result['analyst_thesis']
+            critique = result['critique']
             
-            if monetary_ok:
-                scores.append(monetary_result['score'])
-                weights.append(0.25)
-            if company_ok:
-                scores.append(company_result['score'])
-                weights.append(0.25)
-            if supplier_ok:
-                scores.append(supplier_result['score'])
-                weights.append(0.15)
-            if customer_ok:
-                scores.append(customer_result['score'])
-                weights.append(0.15)
-            if macro_ok:
-                scores.append(macro_result['score'])
-                weights.append(0.20)
-            
-            total_weight = sum(weights)
-            normalized_weights = [w/total_weight for w in weights]
-            combined_score = round(sum(s*w for s, w in zip(scores, normalized_weights)), 1)
-            
-            if combined_score >= 7.5:
-                overall_signal = "STRONG BUY"
-            elif combined_score >= 6.5:
-                overall_signal = "BUY"
-            elif combined_score >= 5.5:
-                overall_signal = "HOLD"
-            else:
-                overall_signal = "SELL"
-            
-            # Store combined score
-            st.session_state.analysis_results['combined_score'] = combined_score
-            st.session_state.analysis_results['combined_signal'] = overall_signal
-            
-            st.markdown("### 🎯 Overall Assessment")
+            st.markdown("---")
+            st.markdown("### 📄 Analyst's View")
             
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                st.metric("Combined Score", f"{combined_score}/10")
+                st.metric("Firm", analyst_thesis.get('analyst_firm', 'Unknown'))
             with col2:
-                st.metric("Overall Signal", overall_signal)
+                st.metric("Rating", analyst_thesis.get('rating', 'N/A'))
             with col3:
-                modules_active = sum([monetary_ok, company_ok, supplier_ok, customer_ok, macro_ok])
-                st.metric("Modules Active", f"{modules_active}/5")
+                fv = analyst_thesis.get('fair_value')
+                st.metric("Fair Value", f"${fv}" if fv else "N/A")
             with col4:
-                st.metric("Analysis Cost", f"${total_cost:.3f}")
+                st.metric("Moat", analyst_thesis.get('economic_moat', 'N/A'))
             
-            # Show cache savings if available
-            if ENTERPRISE_FEATURES and st.session_state.get('cache_manager'):
-                try:
-                    cache_stats = st.session_state.cache_manager.get_stats()
-                    if cache_stats.get('cost_saved_total', 0) > 0:
-                        st.success(f"💰 Total Cost Saved: ${cache_stats['cost_saved_total']:.2f}")
-                except:
-                    pass
+            if analyst_thesis.get('key_thesis'):
+                st.markdown("**Key Investment Thesis:**")
+                for thesis in analyst_thesis['key_thesis']:
+                    st.markdown(f"• {thesis}")
             
             st.markdown("---")
-            st.markdown("### 📊 Module Breakdown")
-            
-            col1, col2, col3, col4, col5 = st.columns(5)
+            st.markdown("### ✅ What They Got Right")
             
-            with col1:
-                if monetary_ok:
-                    score = monetary_result['score']
-                    color = "🟢" if score >= 7 else "🟡" if score >= 6 else "🔴"
-                    st.markdown(f"#### {color} Monetary")
-                    st.metric("Score", f"{score}/10")
-                    st.caption("Weight: 25%")
+            for agree in critique.get('agreement_areas', []):
+                with st.expander(f"✅ {agree.get('topic', 'Agreement')}"):
+                    st.markdown(f"**Analyst's View:** {agree.get('analyst_view', 'N/A')}")
+                    st.markdown(f"**Our Data:** {agree.get('our_data', 'N/A')}")
+                    st.success(agree.get('verdict', 'AGREE'))
             
-            with col2:
-                if company_ok:
-                    score = company_result['score']
-                    color = "🟢" if score >= 7 else "🟡" if score >= 6 else "🔴"
-                    st.markdown(f"#### {color} Company")
-                    st.metric("Score", f"{score}/10")
-                    st.caption("Weight: 25%")
-            
-            with col3:
-                if supplier_ok:
-                    score = supplier_result['score']
-                    color = "🟢" if score >= 7 else "🟡" if score >= 5.5 else "🔴"
-                    st.markdown(f"#### {color} Supply")
-                    st.metric("Score", f"{score}/10")
-                    st.caption("Weight: 15%")
-            
-            with col4:
-                if customer_ok:
-                    score = customer_result['score']
-                    color = "🟢" if score >= 7 else "🟡" if score >= 5.5 else "🔴"
-                    st.markdown(f"#### {color} Demand")
-                    st.metric("Score", f"{score}/10")
-                    st.caption("Weight: 15%")
+            st.markdown("---")
+            st.markdown("### ⚠️ What They Missed")
             
-            with col5:
-                if macro_ok:
-                    score = macro_result['score']
-                    color = "🟢" if score >= 7 else "🟡" if score >= 5.5 else "🔴"
-                    st.markdown(f"#### {color} Macro")
-                    st.metric("Score", f"{score}/10")
-                    st.caption("Weight: 20%")
-        else:
-            st.error("All modules failed")
-    
-    # =========================================================================
-    # TAB 2: Monetary
-    # =========================================================================
-    with tab2:
-        st.markdown(f"## 💰 Monetary Analysis: {ticker}")
-        
-        if monetary_result.get('success'):
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Score", f"{monetary_result['score']}/10")
-            with col2:
-                st.metric("Signal", monetary_result['signal'])
-            with col3:
-                if monetary_result.get('beta'):
-                    st.metric("Beta", f"{monetary_result['beta']:.2f}")
+            for missed in critique.get('missed_factors', []):
+                severity = missed.get('severity', 'Medium')
+                icon = SEVERITY_ICONS.get(severity, "🟢")
+                
+                with st.expander(f"{icon} {missed.get('factor', 'Missed Factor')}"):
+                    st.markdown(f"**Why Important:** {missed.get('why_important', 'N/A')}")
+                    st.markdown(f"**Impact:** {missed.get('impact', 'N/A')}")
+                    st.warning(f"Severity: {severity}")
             
-            st.markdown("### Factor Scores")
-            col1, col2, col3 = st.columns(3)
+            if critique.get('underweighted_risks'):
+                st.markdown("---")
+                st.markdown("### 🔽 Underweighted Risks")
+                
+                for risk in critique['underweighted_risks']:
+                    with st.expander(f"⚠️ {risk.get('risk', 'Risk')}"):
+                        st.markdown(f"**Analyst Treatment:** {risk.get('analyst_treatment', 'N/A')}")
+                        st.markdown(f"**Our Assessment:** {risk.get('our_assessment', 'N/A')}")
+                        st.error(f"**Gap:** {risk.get('gap', 'N/A')}")
             
-            with col1:
-                st.markdown("#### 🏦 Fed Rate")
-                st.metric("Score", f"{monetary_result['fed_score']:+.1f}/2.0")
-                if monetary_result.get('fed'):
-                    st.info(f"Current: {monetary_result['fed']['current']:.2f}%")
+            st.markdown("---")
+            st.markdown("### 🎯 Our Adjusted View")
             
-            with col2:
-                st.markdown("#### 📊 Inflation")
-                st.metric("Score", f"{monetary_result['inf_score']:+.1f}/2.0")
-                if monetary_result.get('inf'):
-                    st.info(f"YoY: {monetary_result['inf']['yoy']:.2f}%")
+            adjusted = critique.get('our_adjusted_view', {})
             
-            with col3:
-                st.markdown("#### 📈 Yields")
-                st.metric("Score", f"{monetary_result['yld_score']:+.1f}/2.0")
-                if monetary_result.get('yld'):
-                    st.info(f"10Y: {monetary_result['yld']['current']:.2f}%")
-        else:
-            st.error(f"Error: {monetary_result.get('error')}")
-    
-    # =========================================================================
-    # TAB 3: Company
-    # =========================================================================
-    with tab3:
-        st.markdown(f"## 📄 Company Performance: {ticker}")
-        
-        if company_result.get('success'):
             col1, col2 = st.columns(2)
             with col1:
-                st.metric("Score", f"{company_result['score']}/10")
+                st.metric("Our Price Target", adjusted.get('price_target', 'N/A'))
             with col2:
-                st.metric("Signal", company_result['signal'])
+                st.metric("Our Rating", adjusted.get('rating', 'N/A'))
             
-            if company_result.get('data_date'):
-                st.caption(f"📅 Data: {company_result['data_date']}")
+            if adjusted.get('key_differences'):
+                st.markdown("**Key Differences:**")
+                for diff in adjusted['key_differences']:
+                    st.markdown(f"• {diff}")
             
-            factors = company_result.get('factors', {})
-            
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.markdown("#### 📊 Revenue")
-                rev = factors.get('revenue_growth', {})
-                st.metric("Score", f"{rev.get('score', 0):+.1f}/2.0")
-                st.caption(rev.get('reasoning', 'N/A'))
-            
-            with col2:
-                st.markdown("#### 📈 Margins")
-                margin = factors.get('margins', {})
-                st.metric("Score", f"{margin.get('score', 0):+.1f}/2.0")
-                st.caption(margin.get('reasoning', 'N/A'))
-            
-            with col3:
-                st.markdown("#### 🏥 Health")
-                health = factors.get('financial_health', {})
-                st.metric("Score", f"{health.get('score', 0):+.1f}/2.0")
-                st.caption(health.get('reasoning', 'N/A'))
-        else:
-            st.error(f"Error: {company_result.get('error')}")
-    
-    # =========================================================================
-    # TAB 4: Suppliers
-    # =========================================================================
-    with tab4:
-        st.markdown(f"## 🏭 Supplier Analysis: {ticker}")
-        
-        if not anthropic_api_key:
-            st.warning("⚠️ Anthropic API key required")
-        elif supplier_result.get('success'):
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Risk Score", f"{supplier_result['score']}/10")
-            with col2:
-                st.metric("Risk Level", supplier_result['signal'])
-            with col3:
-                st.metric("Suppliers", len(supplier_result.get('suppliers', [])))
-            
-            if supplier_result.get('key_findings'):
-                st.markdown("**Key Findings:**")
-                for finding in supplier_result['key_findings']:
-                    st.markdown(f"• {finding}")
+            if adjusted.get('reasoning'):
+                st.info(adjusted['reasoning'])
             
             st.markdown("---")
-            for i, supplier in enumerate(supplier_result.get('suppliers', [])):
-                with st.expander(f"**{i+1}. {supplier['name']}** - {supplier.get('score', 0):+.1f}/2.0"):
-                    st.markdown(f"**Supplies:** {supplier.get('supplies', 'N/A')}")
-                    st.markdown(f"**Importance:** {supplier.get('importance', 'N/A')}")
-                    
-                    if supplier.get('impact_analysis') and supplier['impact_analysis'].get('success'):
-                        impact = supplier['impact_analysis']
-                        if impact.get('summary'):
-                            st.info(impact['summary'])
-        else:
-            st.error(f"Error: {supplier_result.get('error')}")
-    
-    # =========================================================================
-    # TAB 5: Customers
-    # =========================================================================
-    with tab5:
-        st.markdown(f"## 👥 Customer Analysis: {ticker}")
-        
-        if not anthropic_api_key:
-            st.warning("⚠️ Anthropic API key required")
-        elif customer_result.get('success'):
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Demand Score", f"{customer_result['score']}/10")
-            with col2:
-                st.metric("Outlook", customer_result['signal'])
-            with col3:
-                st.metric("Customers", len(customer_result.get('customers', [])))
-            
-            if customer_result.get('key_findings'):
-                st.markdown("**Key Findings:**")
-                for finding in customer_result['key_findings']:
-                    st.markdown(f"• {finding}")
+            st.markdown("### 📝 Critique Summary")
+            st.markdown(critique.get('critique_summary', 'No summary available'))
             
             st.markdown("---")
-            for i, customer in enumerate(customer_result.get('customers', [])):
-                with st.expander(f"**{i+1}. {customer['name']}** - {customer.get('score', 0):+.1f}/2.0"):
-                    st.markdown(f"**Purchases:** {customer.get('purchases', 'N/A')}")
-                    st.markdown(f"**Importance:** {customer.get('importance', 'N/A')}")
-                    
-                    if customer.get('demand_analysis') and customer['demand_analysis'].get('success'):
-                        demand = customer['demand_analysis']
-                        if demand.get('summary'):
-                            st.info(demand['summary'])
-        else:
-            st.error(f"Error: {customer_result.get('error')}")
+            st.caption(f"💰 Analysis Cost: ${result.get('estimated_cost', 0):.3f}")
     
-    # =========================================================================
-    # TAB 6: Macro Factors
-    # =========================================================================
-    with tab6:
-        st.markdown(f"## 🌍 Macro Factors: {ticker}")
-        
-        if not anthropic_api_key:
-            st.warning("⚠️ Anthropic API key required")
-        elif macro_result.get('success'):
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Macro Score", f"{macro_result['score']}/10")
-            with col2:
-                st.metric("Assessment", macro_result['signal'])
-            with col3:
-                cost = macro_result.get('estimated_cost', 0)
-                st.metric("API Cost", f"${cost:.3f}")
-            
-            st.markdown("---")
-            st.markdown("### 📊 Factor Breakdown")
-            st.caption("Weights: 🌍 Geopolitical 30% | ⚖️ Regulatory 25% | 📈 Industry 25% | 🛢️ Commodity 15% | 🌱 ESG 5%")
-            st.markdown("")
-            
-            geo = macro_result.get('geopolitical') or {}
-            reg = macro_result.get('regulatory') or {}
-            ind = macro_result.get('industry') or {}
-            com = macro_result.get('commodity') or {}
-            esg = macro_result.get('esg') or {}
-            
-            with st.expander("🌍 **Geopolitical Risk** (30% weight)", expanded=True):
-                if geo and (geo.get('success') or geo.get('overall_score') is not None):
-                    score = geo.get('overall_score', 0)
-                    if score >= 0:
-                        st.success(f"**Score: {score:+.1f}/2.0** (Low Risk)")
-                    elif score >= -1:
-                        st.warning(f"**Score: {score:+.1f}/2.0** (Moderate Risk)")
-                    else:
-                        st.error(f"**Score: {score:+.1f}/2.0** (High Risk)")
-                    if geo.get('summary'):
-                        st.markdown("**Summary:**")
-                        st.info(geo['summary'])
-                    if geo.get('key_risks'):
-                        st.markdown("**Key Risks:**")
-                        for risk in geo['key_risks']:
-                            st.markdown(f"• {risk}")
-                else:
-                    st.error("Geopolitical analysis not available")
-            
-            with st.expander("⚖️ **Regulatory Risk** (25% weight)"):
-                if reg and (reg.get('success') or reg.get('overall_score') is not None):
-                    score = reg.get('overall_score', 0)
-                    if score >= 0:
-                        st.success(f"**Score: {score:+.1f}/2.0** (Low Risk)")
-                    elif score >= -1:
-                        st.warning(f"**Score: {score:+.1f}/2.0** (Moderate Risk)")
-                    else:
-                        st.error(f"**Score: {score:+.1f}/2.0** (High Risk)")
-                    if reg.get('summary'):
-                        st.markdown("**Summary:**")
-                        st.info(reg['summary'])
-                    if reg.get('key_risks'):
-                        st.markdown("**Key Risks:**")
-                        for risk in reg['key_risks']:
-                            st.markdown(f"• {risk}")
-                else:
-                    st.error("Regulatory analysis not available")
-            
-            with st.expander("📈 **Industry Dynamics** (25% weight)"):
-                if ind and (ind.get('success') or ind.get('overall_score') is not None):
-                    score = ind.get('overall_score', 0)
-                    if score >= 1:
-                        st.success(f"**Score: {score:+.1f}/2.0** (Strong)")
-                    elif score >= 0:
-                        st.info(f"**Score: {score:+.1f}/2.0** (Neutral)")
-                    else:
-                        st.warning(f"**Score: {score:+.1f}/2.0** (Weak)")
-                    if ind.get('summary'):
-                        st.markdown("**Summary:**")
-                        st.info(ind['summary'])
-                    if ind.get('key_trends'):
-                        st.markdown("**Key Trends:**")
-                        for trend in ind['key_trends']:
-                            st.markdown(f"• {trend}")
-                else:
-                    st.error("Industry analysis not available")
-            
-            with st.expander("🛢️ **Commodity & Input Risk** (15% weight)"):
-                if com and (com.get('success') or com.get('overall_score') is not None):
-                    score = com.get('overall_score', 0)
-                    if score >= 0:
-                        st.success(f"**Score: {score:+.1f}/2.0** (Low Risk)")
-                    elif score >= -1:
-                        st.warning(f"**Score: {score:+.1f}/2.0** (Moderate Risk)")
-                    else:
-                        st.error(f"**Score: {score:+.1f}/2.0** (High Risk)")
-                    if com.get('summary'):
-                        st.markdown("**Summary:**")
-                        st.info(com['summary'])
-                    if com.get('key_risks'):
-                        st.markdown("**Key Risks:**")
-                        for risk in com['key_risks']:
-                            st.markdown(f"• {risk}")
-                else:
-                    st.error("Commodity analysis not available")
-            
-            with st.expander("🌱 **ESG Factors** (5% weight)"):
-                if esg and (esg.get('success') or esg.get('overall_score') is not None):
-                    score = esg.get('overall_score', 0)
-                    if score >= 0:
-                        st.success(f"**Score: {score:+.1f}/2.0** (Low Risk)")
-                    elif score >= -1:
-                        st.warning(f"**Score: {score:+.1f}/2.0** (Moderate Risk)")
-                    else:
-                        st.error(f"**Score: {score:+.1f}/2.0** (High Risk)")
-                    if esg.get('summary'):
-                        st.markdown("**Summary:**")
-                        st.info(esg['summary'])
-                    if esg.get('key_issues'):
-                        st.markdown("**Key Issues:**")
-                        for issue in esg['key_issues']:
-                            st.markdown(f"• {issue}")
-                else:
-                    st.error("ESG analysis not available")
-            
-            st.markdown("---")
-            st.markdown("### 💡 Overall Macro Assessment")
-            
-            st.markdown(f"""
-**Weighted Calculation:**
-- 🌍 Geopolitical: {geo.get('overall_score', 0):+.1f} × 30% = {geo.get('overall_score', 0) * 0.30:+.2f}
-- ⚖️ Regulatory: {reg.get('overall_score', 0):+.1f} × 25% = {reg.get('overall_score', 0) * 0.25:+.2f}
-- 📈 Industry: {ind.get('overall_score', 0):+.1f} × 25% = {ind.get('overall_score', 0) * 0.25:+.2f}
-- 🛢️ Commodity: {com.get('overall_score', 0):+.1f} × 15% = {com.get('overall_score', 0) * 0.15:+.2f}
-- 🌱 ESG: {esg.get('overall_score', 0):+.1f} × 5% = {esg.get('overall_score', 0) * 0.05:+.2f}
-
-**Final Score:** {macro_result['score']}/10 → {macro_result['signal']}
-""")
-            
-        else:
-            st.error(f"❌ Error: {macro_result.get('error', 'Unknown error')}")
-    
-    # =========================================================================
-    # TAB 7: ANALYST CRITIQUE
-    # =========================================================================
-    with tab7:
-        st.markdown(f"## 🎯 Analyst Critique: {ticker}")
-        st.markdown("Upload an analyst report (PDF) to compare with our comprehensive analysis")
+    else:
+        # Uploader cleared - don't keep the report's bytes in the session
+        for key in ('pdf_data', 'pdf_sha', 'pdf_upload_key'):
+            st.session_state.pop(key, None)
+        st.info("👆 Upload an analyst report to begin critique")
         
-        if not anthropic_api_key:
-            st.warning("⚠️ Anthropic API key required for analyst critique")
-        else:
-            uploaded_file = st.file_uploader(
-                "Upload Analyst Report (PDF)",
-                type=['pdf'],
-                help="Upload Morningstar, Goldman Sachs, or any analyst report",
-                key="analyst_pdf"
-            )
-            
-            if uploaded_file is not None:
-                st.success(f"✅ Uploaded: {uploaded_file.name}")
-                
-                if st.button("🔍 Critique This Report", type="primary", key="critique_btn"):
-                    with st.spinner("Analyzing analyst report and generating critique..."):
-                        try:
-                            pdf_data = uploaded_file.read()
-                            critique_engine = AnalystCritique(anthropic_api_key=anthropic_api_key)
-                            platform_data = st.session_state.analysis_results
-                            
-                            result = critique_engine.generate_critique(
-                                pdf_data=pdf_data,
-                                filename=uploaded_file.name,
-                                platform_data=platform_data
-                            )
-                            
-                            if result.get('success'):
-                                analyst_thesis = result['analyst_thesis']
-                                critique = result['critique']
-                                
-                                st.markdown("---")
-                                st.markdown("### 📄 Analyst's View")
-                                
-                                col1, col2, col3, col4 = st.columns(4)
-                                with col1:
-                                    st.metric("Firm", analyst_thesis.get('analyst_firm', 'Unknown'))
-                                with col2:
-                                    st.metric("Rating", analyst_thesis.get('rating', 'N/A'))
-                                with col3:
-                                    fv = analyst_thesis.get('fair_value')
-                                    st.metric("Fair Value", f"${fv}" if fv else "N/A")
-                                with col4:
-                                    st.metric("Moat", analyst_thesis.get('economic_moat', 'N/A'))
-                                
-                                if analyst_thesis.get('key_thesis'):
-                                    st.markdown("**Key Investment Thesis:**")
-                                    for thesis in analyst_thesis['key_thesis']:
-                                        st.markdown(f"• {thesis}")
-                                
-                                st.markdown("---")
-                                st.markdown("### ✅ What They Got Right")
-                                
-                                for agree in critique.get('agreement_areas', []):
-                                    with st.expander(f"✅ {agree.get('topic', 'Agreement')}"):
-                                        st.markdown(f"**Analyst's View:** {agree.get('analyst_view', 'N/A')}")
-                                        st.markdown(f"**Our Data:** {agree.get('our_data', 'N/A')}")
-                                        st.success(agree.get('verdict', 'AGREE'))
-                                
-                                st.markdown("---")
-                                st.markdown("### ⚠️ What They Missed")
-                                
-                                for missed in critique.get('missed_factors', []):
-                                    severity = missed.get('severity', 'Medium')
-                                    icon = "🔴" if severity == "High" else "🟡" if severity == "Medium" else "🟢"
-                                    
-                                    with st.expander(f"{icon} {missed.get('factor', 'Missed Factor')}"):
-                                        st.markdown(f"**Why Important:** {missed.get('why_important', 'N/A')}")
-                                        st.markdown(f"**Impact:** {missed.get('impact', 'N/A')}")
-                                        st.warning(f"Severity: {severity}")
-                                
-                                if critique.get('underweighted_risks'):
-                                    st.markdown("---")
-                                    st.markdown("### 🔽 Underweighted Risks")
-                                    
-                                    for risk in critique['underweighted_risks']:
-                                        with st.expander(f"⚠️ {risk.get('risk', 'Risk')}"):
-                                            st.markdown(f"**Analyst Treatment:** {risk.get('analyst_treatment', 'N/A')}")
-                                            st.markdown(f"**Our Assessment:** {risk.get('our_assessment', 'N/A')}")
-                                            st.error(f"**Gap:** {risk.get('gap', 'N/A')}")
-                                
-                                st.markdown("---")
-                                st.markdown("### 🎯 Our Adjusted View")
-                                
-                                adjusted = critique.get('our_adjusted_view', {})
-                                
-                                col1, col2 = st.columns(2)
-                                with col1:
-                                    st.metric("Our Price Target", adjusted.get('price_target', 'N/A'))
-                                with col2:
-                                    st.metric("Our Rating", adjusted.get('rating', 'N/A'))
-                                
-                                if adjusted.get('key_differences'):
-                                    st.markdown("**Key Differences:**")
-                                    for diff in adjusted['key_differences']:
-                                        st.markdown(f"• {diff}")
-                                
-                                if adjusted.get('reasoning'):
-                                    st.info(adjusted['reasoning'])
-                                
-                                st.markdown("---")
-                                st.markdown("### 📝 Critique Summary")
-                                st.markdown(critique.get('critique_summary', 'No summary available'))
-                                
-                                st.markdown("---")
-                                st.caption(f"💰 Analysis Cost: ${result.get('estimated_cost', 0):.3f}")
-                                
-                            else:
-                                st.error(f"❌ Error: {result.get('error', 'Unknown error')}")
-                        
-                        except Exception as e:
-                            st.error(f"❌ Error processing report: {str(e)}")
-            
-            else:
-                st.info("👆 Upload an analyst report to begin critique")
-                
-                with st.expander("📊 See Example Output"):
-                    st.markdown("""
+        with st.expander("📊 See Example Output"):
+            st.markdown("""
 **Example: Morningstar NVDA Report Critique**
 
 ✅ **What They Got Right:**
@@ -972,16 +1098,21 @@ if st.session_state.analysis_complete:
 - Our Target: $165-170
 - Reason: Underweights geopolitical (-$10) and supply chain risk (-$10)
 """)
+
+
+# ----------------------------------------------------------------------------
+# TAB 8: INTELLIGENCE DASHBOARD
+# ----------------------------------------------------------------------------
+@tab_fragment
+def render_intelligence_tab(results):
+    """Intelligence Dashboard tab"""
+    ticker = results['ticker']
     
-    # =========================================================================
-    # TAB 8: INTELLIGENCE DASHBOARD (NEW!)
-    # =========================================================================
-    with tab8:
-        st.markdown(f"## 🧠 Intelligence Dashboard: {ticker}")
-        
-        if not ENTERPRISE_FEATURES:
-            st.warning("⚠️ Enterprise features not available")
-            st.info("""
+    st.markdown(f"## 🧠 Intelligence Dashboard: {ticker}")
+    
+    if not ENTERPRISE_FEATURES:
+        st.warning("⚠️ Enterprise features not available")
+        st.info("""
 **To enable Intelligence features:**
 1. Add `cache_manager.py` to your project
 2. Add `sentinel_engine.py` to your project
@@ -993,144 +1124,285 @@ These files enable:
 - Change detection
 - Trend analysis
 """)
-        else:
-            # Cache Statistics
-            st.markdown("### 💰 Cache Performance")
-            
-            try:
-                cache_stats = st.session_state.cache_manager.get_stats()
-                
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.metric("Total Cached", cache_stats.get('total_items', 0))
-                with col2:
-                    st.metric("Fresh Items", cache_stats.get('fresh_items', 0))
-                with col3:
-                    st.metric("Hit Rate", f"{cache_stats.get('hit_rate', 0):.0f}%")
-                with col4:
-                    st.metric("Cost Saved", f"${cache_stats.get('cost_saved_total', 0):.2f}")
-            except Exception as e:
-                st.error(f"Error loading cache stats: {e}")
+    else:
+        # Cache Statistics
+        st.markdown("### 💰 Cache Performance")
+        
+        try:
+            cache_manager = st.session_state.cache_manager
+            cache_stats = cached_cache_stats(cache_manager, cache_manager.db_path)
             
-            # Historical Trends
-            st.markdown("---")
-            st.markdown("### 📈 Historical Trends")
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Total Cached", cache_stats.get('total_items', 0))
+            with col2:
+                st.metric("Fresh Items", cache_stats.get('fresh_items', 0))
+            with col3:
+                st.metric("Hit Rate", f"{cache_stats.get('hit_rate', 0):.0f}%")
+            with col4:
+                st.metric("Cost Saved", f"${cache_stats.get('cost_saved_total', 0):.2f}")
+        except Exception as e:
+            st.error(f"Error loading cache stats: {e}")
+        
+        # Historical Trends
+        st.markdown("---")
+        st.markdown("### 📈 Historical Trends")
+        
+        try:
+            sentinel = st.session_state.sentinel
+            trend_data = cached_historical_trend(
+                sentinel, sentinel.db_path, ticker, 90, results.get('timestamp')
+            )
             
-            try:
-                trend_data = st.session_state.sentinel.get_historical_trend(ticker, days=90)
+            if trend_data and trend_data.get('history'):
+                st.info(f"**Trend:** {trend_data['trend'].upper()} ({trend_data['analyses_count']} analyses)")
                 
-                if trend_data and trend_data.get('history'):
-                    st.info(f"**Trend:** {trend_data['trend'].upper()} ({trend_data['analyses_count']} analyses)")
-                    
-                    # Create chart
-                    history = trend_data['history']
-                    dates = [h['date'] for h in history]
-                    scores = [h['score'] for h in history]
-                    
-                    fig = go.Figure()
-                    fig.add_trace(go.Scatter(
-                        x=dates, 
-                        y=scores, 
-                        mode='lines+markers',
-                        name='Combined Score',
-                        line=dict(color='#1f77b4', width=2),
-                        marker=dict(size=8)
-                    ))
-                    fig.add_hline(y=7.5, line_dash="dash", line_color="green", 
-                                  annotation_text="Strong Buy", annotation_position="right")
-                    fig.add_hline(y=5.5, line_dash="dash", line_color="orange",
-                                  annotation_text="Hold", annotation_position="right")
-                    fig.update_layout(
-                        title="Score Trend Over Time",
-                        xaxis_title="Date",
-                        yaxis_title="Combined Score",
-                        yaxis_range=[0, 10],
-                        height=400
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.info("📊 Run multiple analyses to see trends over time")
-            except Exception as e:
+                # Create chart
+                history = trend_data['history']
+                points = np.fromiter(
+                    ((h['date'], np.nan if h['score'] is None else h['score']) for h in history),
+                    dtype=[('date', 'U32'), ('score', 'f8')],
+                    count=len(history)
+                )
+                points = points[lttb_indices(points['score'])]
+                dates, scores = points['date'], points['score']
+                
+                st.markdown("**Score Trend Over Time**")
+                st.line_chart(build_trend_frame(ticker, dates, scores), height=400)
+            else:
                 st.info("📊 Run multiple analyses to see trends over time")
+        except Exception as e:
+            st.info("📊 Run multiple analyses to see trends over time")
+        
+        # Recent Changes
+        st.markdown("---")
+        st.markdown("### ⚠️ Recent Changes Detected")
+        
+        try:
+            changes = st.session_state.sentinel.get_recent_changes(ticker, days=30)
             
-            # Recent Changes
-            st.markdown("---")
-            st.markdown("### ⚠️ Recent Changes Detected")
-            
-            try:
-                changes = st.session_state.sentinel.get_recent_changes(ticker, days=30)
-                
-                if changes:
-                    for change in changes[:5]:
-                        severity = change.get('significance', 'MEDIUM')
-                        emoji = {"HIGH": "🔴", "MEDIUM": "🟡", "LOW": "🟢"}.get(severity, "ℹ️")
-                        st.markdown(f"{emoji} **{change['module']}**: {change['field']}")
-                        st.caption(f"Changed from `{change['from']}` to `{change['to']}` on {change['date'][:10]}")
-                else:
-                    st.info("✅ No significant changes detected recently")
-            except Exception as e:
+            if changes:
+                for change in changes[:5]:
+                    severity = change.get('significance', 'MEDIUM')
+                    emoji = SIGNIFICANCE_ICONS.get(severity, "ℹ️")
+                    st.markdown(f"{emoji} **{change['module']}**: {change['field']}")
+                    st.caption(f"Changed from `{change['from']}` to `{change['to']}` on {change['date'][:10]}")
+            else:
                 st.info("✅ No significant changes detected recently")
+        except Exception as e:
+            st.info("✅ No significant changes detected recently")
+        
+        # Learned Insights
+        st.markdown("---")
+        st.markdown("### 💡 Learned Insights")
+        
+        try:
+            insights = st.session_state.sentinel.get_learned_insights(ticker)
             
-            # Learned Insights
+            if insights:
+                for insight in insights[:5]:
+                    with st.expander(f"💡 {insight['type'].replace('_', ' ').title()}"):
+                        st.markdown(insight['insight'])
+                        st.caption(f"Confidence: {insight['confidence']:.0%} | Learned: {insight['learned_date'][:10]}")
+            else:
+                st.info("🎓 Run more analyses to build intelligence about this stock")
+        except Exception as e:
+            st.info("🎓 Run more analyses to build intelligence about this stock")
+        
+        # Agent Status (if available)
+        if AGENT_AVAILABLE and st.session_state.get('agent_enabled'):
             st.markdown("---")
-            st.markdown("### 💡 Learned Insights")
+            st.markdown("### 🤖 Autonomous Agent Status")
             
             try:
-                insights = st.session_state.sentinel.get_learned_insights(ticker)
+                status = st.session_state.agent.get_status()
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.markdown("**📋 Active Watchlist:**")
+                    watchlist = status.get('watchlist', [])
+                    if watchlist:
+                        for item in watchlist:
+                            importance = item.get('importance', 3)
+                            stars = "⭐" * importance
+                            st.caption(f"• {item['ticker']} {stars}")
+                    else:
+                        st.caption("No tickers in watchlist")
+                
+                with col2:
+                    st.markdown("**⚡ Pending Actions:**")
+                    pending = status.get('pending_actions', [])
+                    if pending:
+                        for action in pending[:3]:
+                            st.caption(f"• {action.get('type', 'Action')}: {action.get('ticker', 'N/A')}")
+                    else:
+                        st.caption("No pending actions")
+                
+                # Active alerts
+                alerts = status.get('active_alerts', [])
+                if alerts:
+                    st.markdown("**🚨 Active Alerts:**")
+                    for alert in alerts[:3]:
+                        st.warning(f"**{alert['ticker']}**: {alert['message']}")
                 
-                if insights:
-                    for insight in insights[:5]:
-                        with st.expander(f"💡 {insight['type'].replace('_', ' ').title()}"):
-                            st.markdown(insight['insight'])
-                            st.caption(f"Confidence: {insight['confidence']:.0%} | Learned: {insight['learned_date'][:10]}")
-                else:
-                    st.info("🎓 Run more analyses to build intelligence about this stock")
             except Exception as e:
-                st.info("🎓 Run more analyses to build intelligence about this stock")
-            
-            # Agent Status (if available)
-            if AGENT_AVAILABLE and st.session_state.get('agent_enabled'):
-                st.markdown("---")
-                st.markdown("### 🤖 Autonomous Agent Status")
+                st.error(f"Error loading agent status: {e}")
+        
+        elif AGENT_AVAILABLE:
+            st.markdown("---")
+            st.info("🤖 **Autonomous Agent Available** - Start it from the sidebar to enable 24/7 monitoring")
+
+
+# ============================================================================
+# MAIN APP
+# ============================================================================
+if not fred_api_key:
+    st.info("👈 Enter your FRED API key in the sidebar")
+    st.stop()
+
+# Stock input
+col1, col2 = st.columns([3, 1])
+with col1:
+    # Normalized once here - analyzers and cache keys all see the same symbol
+    ticker = st.text_input("Stock Ticker", value="NVDA", help="Enter stock symbol").strip().upper()
+with col2:
+    st.write("")
+    st.write("")
+    analyze_btn = st.button("📊 Analyze All Modules", type="primary")
+
+# ============================================================================
+# RUN ANALYSIS
+# ============================================================================
+if analyze_btn and ticker:
+    with st.spinner(f"Analyzing {ticker} (90-120 seconds)..."):
+        # Run all analyses concurrently - every module is network-bound
+        api_key_required = ({'success': False, 'error': 'API key required'}, 0.0)
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            monetary_future = executor.submit(
+                run_module, partial(get_monetary_analyzer, fred_api_key), ticker
+            )
+            company_future = executor.submit(
+                run_module, get_company_analyzer, ticker, ('cost', 0.02), verbose=False
+            )
+            if anthropic_api_key:
+                from supplier_analyzer import SupplierAnalyzer
+                from customer_analyzer import CustomerAnalyzer
+                from macro_analyzer import MacroFactorAnalyzer
                 
-                try:
-                    status = st.session_state.agent.get_status()
-                    
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.markdown("**📋 Active Watchlist:**")
-                        watchlist = status.get('watchlist', [])
-                        if watchlist:
-                            for item in watchlist:
-                                importance = item.get('importance', 3)
-                                stars = "⭐" * importance
-                                st.caption(f"• {item['ticker']} {stars}")
-                        else:
-                            st.caption("No tickers in watchlist")
-                    
-                    with col2:
-                        st.markdown("**⚡ Pending Actions:**")
-                        pending = status.get('pending_actions', [])
-                        if pending:
-                            for action in pending[:3]:
-                                st.caption(f"• {action.get('type', 'Action')}: {action.get('ticker', 'N/A')}")
-                        else:
-                            st.caption("No pending actions")
-                    
-                    # Active alerts
-                    alerts = status.get('active_alerts', [])
-                    if alerts:
-                        st.markdown("**🚨 Active Alerts:**")
-                        for alert in alerts[:3]:
-                            st.warning(f"**{alert['ticker']}**: {alert['message']}")
-                    
-                except Exception as e:
-                    st.error(f"Error loading agent status: {e}")
+                supplier_progress = queue.Queue()
+                supplier_future = executor.submit(
+                    run_module, partial(SupplierAnalyzer, anthropic_api_key=anthropic_api_key),
+                    ticker, ('estimated_cost', 0.17), verbose=False,
+                    on_supplier=supplier_progress.put
+                )
+                customer_future = executor.submit(
+                    run_module, partial(CustomerAnalyzer, anthropic_api_key=anthropic_api_key),
+                    ticker, ('estimated_cost', 0.17), verbose=False
+                )
+                macro_future = executor.submit(
+                    run_module, partial(MacroFactorAnalyzer, anthropic_api_key=anthropic_api_key),
+                    ticker, ('estimated_cost', 0.06), verbose=False
+                )
+                
+                # Worker threads can't touch the page, so suppliers are
+                # relayed through a queue and written from here as they land
+                with st.status("Analyzing suppliers...") as supplier_status:
+                    while not (supplier_future.done() and supplier_progress.empty()):
+                        try:
+                            supplier = supplier_progress.get(timeout=0.25)
+                        except queue.Empty:
+                            continue
+                        st.write(f"Found: {supplier.get('name', 'Unknown')}")
+                    if supplier_future.result()[0].get('error'):
+                        supplier_status.update(label="Supplier analysis failed", state="error")
+                    else:
+                        supplier_status.update(label="Supplier analysis complete", state="complete")
+        
+        monetary_result, monetary_cost = monetary_future.result()
+        company_result, company_cost = company_future.result()
+        if anthropic_api_key:
+            supplier_result, supplier_cost = supplier_future.result()
+            customer_result, customer_cost = customer_future.result()
+            macro_result, macro_cost = macro_future.result()
+        else:
+            supplier_result, supplier_cost = api_key_required
+            customer_result, customer_cost = api_key_required
+            macro_result, macro_cost = api_key_required
+        
+        total_cost = monetary_cost + company_cost + supplier_cost + customer_cost + macro_cost
+    
+    # Store results in session state
+    st.session_state.analysis_results = {
+        'ticker': ticker,
+        'monetary': monetary_result,
+        'company': company_result,
+        'suppliers': supplier_result,
+        'customers': customer_result,
+        'macro': macro_result,
+        'total_cost': total_cost,
+        'timestamp': datetime.now().isoformat()
+    }
+    st.session_state.analysis_complete = True
+    
+    # =========================================================================
+    # ENTERPRISE: Learn from this analysis
+    # =========================================================================
+    if ENTERPRISE_FEATURES and st.session_state.get('sentinel'):
+        try:
+            key_insights = []
+            if supplier_result.get('success'):
+                key_insights.extend(supplier_result.get('key_findings', []))
+            if customer_result.get('success'):
+                key_insights.extend(customer_result.get('key_findings', []))
             
-            elif AGENT_AVAILABLE:
-                st.markdown("---")
-                st.info("🤖 **Autonomous Agent Available** - Start it from the sidebar to enable 24/7 monitoring")
+            st.session_state.sentinel.learn_from_analysis(ticker, {
+                **st.session_state.analysis_results,
+                'key_insights': key_insights
+            })
+        except Exception as e:
+            print(f"Sentinel learning failed: {e}")
+
+# ============================================================================
+# DISPLAY RESULTS IN TABS
+# ============================================================================
+if st.session_state.analysis_complete:
+    # Get results from session state
+    results = st.session_state.analysis_results
+    
+    llm_enabled = bool(anthropic_api_key)
+    if not llm_enabled:
+        st.warning("⚠️ Anthropic API key required for Suppliers, Customers, Macro and Analyst Critique")
+    
+    # Create tabs - 8 tabs with an Anthropic key (including Intelligence)
+    tab_labels = ["📊 Summary", "💰 Monetary", "📄 Company"]
+    if llm_enabled:
+        tab_labels += ["🏭 Suppliers", "👥 Customers", "🌍 Macro", "🎯 Analyst Critique"]
+    tabs = st.tabs(tab_labels + ["🧠 Intelligence"])
+    tab1, tab2, tab3, tab8 = tabs[0], tabs[1], tabs[2], tabs[-1]
+    if llm_enabled:
+        tab4, tab5, tab6, tab7 = tabs[3:7]
+    
+    with tab1:
+        render_summary_tab(results)
+    with tab2:
+        render_monetary_tab(results)
+    with tab3:
+        render_company_tab(results)
+    
+    # LLM-backed tabs are only mounted when an Anthropic key is configured
+    if llm_enabled:
+        with tab4:
+            render_supplier_tab(results)
+        with tab5:
+            render_customer_tab(results)
+        with tab6:
+            render_macro_tab(results)
+        with tab7:
+            render_critique_tab(results)
+    
+    with tab8:
+        render_intelligence_tab(results)
 
 # ============================================================================
 # DISCLAIMER
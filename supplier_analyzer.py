@@ -8,7 +8,7 @@ import anthropic
 import os
 import yfinance as yf
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 import json
 import re
 import time
@@ -456,8 +456,14 @@ Return ONLY valid JSON."""
         
         return max(-2.0, min(2.0, score))
     
-    def analyze(self, ticker: str, verbose: bool = True) -> Dict:
-        """Complete enhanced supplier analysis with caching"""
+    def analyze(self, ticker: str, verbose: bool = True,
+                on_supplier: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """
+        Complete enhanced supplier analysis with caching
+        
+        on_supplier, if given, is called with each supplier's result as soon
+        as it has been scored, so callers can show progress incrementally.
+        """
         
         if verbose:
             print(f"\n{'='*80}")
@@ -546,6 +552,8 @@ Return ONLY valid JSON."""
                     print(f"     🔒 Private company")
             
             analyzed_suppliers.append(supplier_result)
+            if on_supplier:
+                on_supplier(supplier_result)
         
         # Calculate aggregate score
         scores = [s.get('score', 0) for s in analyzed_suppliers]